@@ -1,17 +1,24 @@
 import argparse
-import configparser
-from datetime import datetime
+from collections import OrderedDict
 try:
     import grp, pwd
 except ModuleNotFoundError:
     pass
-from fnmatch import fnmatch
-import hashlib
+import functools
 from math import ceil
 import os
 import re
+import stat
 import sys
-import zlib
+
+# Size of the slices fed to zlib when reading and writing objects
+OBJECT_CHUNK_SIZE = 256 * 1024
+# zlib level for loose objects, 1 is much faster than the default 6 for a slightly bigger file
+LOOSE_OBJECT_COMPRESSION_LEVEL = 1
+# Largest payload buffer allocated up front from the size in an object header, bigger objects grow into it
+OBJECT_PREALLOC_MAX = 16 * 1024 * 1024
+# Upper bound on how much gets inflated while looking for the end of an object header
+OBJECT_HEADER_MAX = 64
 
 # -- Repo 
 class GitRepository (object):
@@ -20,28 +27,65 @@ class GitRepository (object):
     worktree = None
     gitdir = None
     conf = None
+    objects_dir = None
 
     def __init__(self, path, force=False):
         self.worktree = path
         self.gitdir = os.path.join(path, ".git")
+        # Every object read and write starts from here, so join it once
+        self.objects_dir = os.path.join(self.gitdir, "objects")
 
-        if not (force or os.path.isdir(self.gitdir)):
+        if not (force or _has_gitdir(path)):
             raise Exception(f"Not a Git repository {path}")
         
         # Read config file in .git/config
-        self.conf = configparser.ConfigParser()
+        self.conf = {}
         cf = repo_file(self, "config")
 
         if cf and os.path.exists(cf):
-            self.conf.read([cf])
+            self.conf = _read_git_config(cf)
         elif not force:
             raise Exception("Configuration file missing")
         
         if not force:
-            version = int(self.conf.get("core", "repositoryformatversion"))
+            version = int(self.conf["core"]["repositoryformatversion"])
             if version != 0:
                 raise Exception(f"Unsupported repositoryformatversion: {version}")
 
+def _has_gitdir(path):
+    """Checks if path contains a .git directory
+       Uses the d_type cached by scandir, so no extra stat is needed unless .git is a symlink
+    """
+    try:
+        with os.scandir(path) as entries:
+            return any(e.name == ".git" and e.is_dir() for e in entries)
+    except PermissionError:
+        # Directory can't be listed, but .git inside it may still be reachable
+        return os.path.isdir(os.path.join(path, ".git"))
+    except OSError:
+        return False
+
+def _read_git_config(path):
+    """Parse the INI-like .git/config into a dict of sections, ex. {"core": {"bare": "false"}}"""
+    conf = {}
+    section = None
+
+    with open(path, "r") as f:
+        for line in f.read().splitlines():
+            line = line.strip()
+            # Skip blank lines and comments
+            if not line or line[0] in "#;":
+                continue
+            if line[0] == "[" and line[-1] == "]":
+                section = conf.setdefault(line[1:-1].strip(), {})
+                continue
+            if section is None:
+                raise Exception(f"Malformed config {path}: key outside of a section")
+            key, _, val = line.partition("=")
+            section[key.strip().lower()] = val.strip()
+
+    return conf
+
 def repo_path(repo, *path):
     """"Compute path under the repo git directory"""
     # Star on *path makes the function variadic, so it can be called with multiple path components as seperate arguments
@@ -62,29 +106,37 @@ def repo_dir(repo, *path, mkdir=False):
     path = repo_path(repo, *path)
 
     # if path exists (file or directory), then checks if it is a directory, if not then raise exception
-    if os.path.exists(path):
-        if (os.path.isdir(path)):
+    # A single stat answers both questions
+    try:
+        st = os.stat(path)
+    except OSError:
+        # Same as os.path.exists, ex. a parent that is a file means the path is just missing
+        pass
+    else:
+        if stat.S_ISDIR(st.st_mode):
             return path
         else:
             raise Exception(f"Not a directory {path}")
     
     # if path doesn't exist then make the directory if mkdir is True
     if mkdir:
-        os.makedirs(path)
+        # exist_ok since it may have appeared between the stat above and here
+        os.makedirs(path, exist_ok=True)
         return path
     else:
         return None
     
+def _repo_write(repo, relpath, content):
+    """Write content to a file directly under gitdir, which must already exist"""
+    with open(os.path.join(repo.gitdir, relpath), "w") as f:
+        f.write(content)
+
 def repo_default_config():
     """Config file to setup an INI-like file with a single section [core] and three fields"""
-    ret = configparser.ConfigParser()
-
-    ret.add_section("core")
-    ret.set("core", "repositoryformatversion", "0")
-    ret.set("core", "filemode", "false")
-    ret.set("core", "bare", "false")
-
-    return ret
+    return ("[core]\n"
+            "\trepositoryformatversion = 0\n"
+            "\tfilemode = false\n"
+            "\tbare = false\n")
     
 def repo_create(path):
     """Create a new repository at path"""
@@ -101,52 +153,60 @@ def repo_create(path):
     else:
         os.makedirs(repo.worktree)
     
-    repo_dir(repo, "branches", mkdir=True)
-    repo_dir(repo, "objects", mkdir=True)
-    repo_dir(repo, "refs", "tags", mkdir=True)
-    repo_dir(repo, "refs", "heads", mkdir=True)
+    # Only the leaves are needed, makedirs builds .git and refs along the way
+    for rel in ("branches", "objects", os.path.join("refs", "tags"), os.path.join("refs", "heads")):
+        os.makedirs(os.path.join(repo.gitdir, rel), exist_ok=True)
 
     # .git/description
-    with open(repo_file(repo, "description"), "w") as f:
-        f.write("Unnamed repository; edit this file 'description' to name the repository.\n")
+    _repo_write(repo, "description", "Unnamed repository; edit this file 'description' to name the repository.\n")
 
     # .git/HEAD
-    with open(repo_file(repo, "HEAD"), "w") as f:
-        f.write("ref: refs/heads/master\n")
+    _repo_write(repo, "HEAD", "ref: refs/heads/master\n")
 
-    with open(repo_file(repo, "config"), "w") as configfile:
-        config = repo_default_config()
-        config.write(configfile)
+    # .git/config
+    _repo_write(repo, "config", repo_default_config())
 
     return repo
 
+@functools.lru_cache(maxsize=32)
+def _load_repo(path):
+    """Build the GitRepository for a resolved worktree path once per process"""
+    return GitRepository(path)
+
+def repo_cache_clear():
+    """Forget repositories loaded by repo_find, ex. after .git/config was changed"""
+    _load_repo.cache_clear()
+
 def repo_find(path=".", required=True):
-    """"Function to recursively find the root of the directory"""
+    """"Function to walk up from path until the root of the directory is found"""
     path = os.path.realpath(path)
 
-    # We will know if we have reached the root directory if the path contains a .git folder
-    if os.path.isdir(os.path.join(path, ".git")):
-        return GitRepository(path)
+    while True:
+        # We will know if we have reached the root directory if the path contains a .git folder
+        if _has_gitdir(path):
+            return _load_repo(path)
 
-    # If haven't returned, go up one level to parent
-    parent = os.path.realpath(os.path.join(path, ".."))
+        # If haven't returned, go up one level to parent
+        parent = os.path.dirname(path)
 
-    if parent == path:
-        # if parent==path, then path is root
-        if required:
-            raise Exception("No git directory.")
-        else:
-            return None
-            # return for this base case
-    
-    return repo_find(path, required)
+        if parent == path:
+            # if parent==path, then path is root
+            if required:
+                raise Exception("No git directory.")
+            else:
+                return None
+
+        path = parent
 
 # -- Object
 class GitObject (object):
 
     def __init__(self, data=None):
-        if data:
+        # Empty blobs and trees are valid objects, so only None means "no data"
+        if data is not None:
             self.deserialize(data)
+        else:
+            self.init()
 
     def serialize(self, repo):
         """Function must be implemented by subclasses.
@@ -156,6 +216,10 @@ class GitObject (object):
         raise Exception("Unimplemented!")
 
     def deserialize(self, data):
+        """Function must be implemented by subclasses.
+        data is any bytes-like object, object_read passes a read-only memoryview into the inflated payload so nothing gets copied
+        memoryview has no find/split/decode, subclasses that need them call bytes(data) first
+        """
         raise Exception("Unimplemented!")
 
     def init(self):
@@ -171,61 +235,299 @@ class GitBlob(GitObject):
     def deserialize(self, data):
         self.blobdata = data
 
-def object_read(repo, sha):
+class GitTree(GitObject):
+    """Subclass of GitObject, entries are stored as columns instead of one Python object per entry
+       Entry i is modes[i], names[i] and the 20 raw bytes shas[20*i:20*i+20]
+    """
+    fmt = b"tree"
+
+    def init(self):
+        self.modes = []
+        self.names = []
+        self.shas = b""
+
+    def serialize(self):
+        shas = self.shas
+        return b"".join(b"%s %s\x00%s" % (mode, name, shas[20*i:20*i+20])
+                        for i, (mode, name) in enumerate(zip(self.modes, self.names)))
+
+    def deserialize(self, data):
+        """Each entry is <mode> <name>\\x00<20 byte sha>, read in a single pass over data
+           The entry count is only known once the scan is done, so shas grows in a bytearray
+           instead of being preallocated, and the final bytes() copy is 20 bytes per entry
+        """
+        entry = _TREE_ENTRY
+
+        modes = []
+        names = []
+        shas = bytearray()
+        pos = 0
+        end = len(data)
+        while pos < end:
+            m = entry.match(data, pos)
+            if m is None or m.end() + 20 > end:
+                raise Exception("Malformed tree: bad entry")
+            modes.append(m.group(1))
+            names.append(m.group(2))
+            pos = m.end() + 20
+            shas += data[m.end():pos]
+
+        self.modes = modes
+        self.names = names
+        self.shas = bytes(shas)
+
+# Object type from the header -> constructor, commit/tag get added here as their classes are implemented
+# Keyed by the fmt bytes themselves, a (len(fmt), fmt[0]) key measured slower and can't reject garbage types without a full compare
+_FMT_TO_CLS = {
+    b"blob" : GitBlob,
+    b"tree" : GitTree,
+}
+
+# The <mode> <name>\x00 part of a tree entry, the 20 byte sha that follows is sliced off directly
+_TREE_ENTRY = re.compile(rb"([0-7]+) ([^\x00]*)\x00")
+
+def _object_path(repo, sha):
+    """Path of the loose object sha, ex. .git/objects/e6/9de29bb2d1d6434b8b29ae775ad8c2e48c5391"""
+    return f"{repo.objects_dir}{os.sep}{sha[:2]}{os.sep}{sha[2:]}"
+
+def _open_sequential(path):
+    """Open path unbuffered for one front-to-back read, hinting the kernel to read ahead"""
+    fd = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    try:
+        # posix_fadvise only exists on some platforms, elsewhere the hint is skipped
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        return os.fdopen(fd, "rb", buffering=0)
+    except Exception:
+        os.close(fd)
+        raise
+
+def object_read(repo, sha, header_only=False):
     """Reads object SHA from the git repo.
        00000000  63 6f 6d 6d 69 74 20 31  30 38 36 00 74 72 65 65  |commit 1086.tree|
-       Convert sha to readable byte string using zlib
+       Convert sha to readable byte string using zlib, inflating big objects chunk by chunk
        Return a GitObject whose exact type depends on the type retrieved from the sha
+       If header_only is True, stop after the header and return (fmt, size) instead
     """
+    # Imported here so commands that never touch objects don't pay for it
+    import zlib
 
-    path = repo_file(repo, "objects", sha[0:2], sha[2:])
+    path = _object_path(repo, sha)
 
     if not os.path.isfile(path):
         return None
-    
-    # Read the binary file and convert to readable bytes
-    with open (path, "rb") as f:
-        raw = zlib.decompress(f.read())
 
-        # Read object type by finding the byte representative of " "
-        x = raw.find(b" ")
-        fmt = raw[0:x]
+    with _open_sequential(path) as f:
+        d = zlib.decompressobj()
 
-        # Locate the null byte to find the size of the object
-        y = raw.find(b"\x00", x)
-        size = int(raw[x:y])
-        if size != len(raw)-y-1:
-            raise Exception(f"Malformed object {sha}: bad length")
+        # Most commits and trees are smaller than a chunk on disk, inflate those in one call
+        # The header is then parsed straight out of the whole object
+        # A header-only read never takes this path, a small file can still inflate to a huge payload
+        if not header_only and os.fstat(f.fileno()).st_size < OBJECT_CHUNK_SIZE:
+            # Output is bounded too, anything bigger carries on below as a streamed read
+            header_buf = d.decompress(f.read(), OBJECT_CHUNK_SIZE)
+        else:
+            # Inflate only until the null byte that ends the header shows up
+            # A header is never longer than OBJECT_HEADER_MAX, so stop looking past that
+            header_buf = b""
+            chunk = f.read(OBJECT_CHUNK_SIZE)
+            while True:
+                header_buf += d.decompress(chunk, OBJECT_HEADER_MAX)
+                if b"\x00" in header_buf or len(header_buf) >= OBJECT_HEADER_MAX:
+                    break
+                chunk = d.unconsumed_tail or f.read(OBJECT_CHUNK_SIZE)
+                if not chunk:
+                    raise Exception(f"Malformed object {sha}: truncated header")
+
+        # Read object type by finding the byte representative of " "
+        # Searches are bounded to the header window, never the payload
+        mv = memoryview(header_buf)
+        try:
+            x = header_buf.index(b" ", 0, OBJECT_HEADER_MAX)
+            # Locate the null byte to find the size of the object
+            y = header_buf.index(b"\x00", x, OBJECT_HEADER_MAX)
+        except ValueError:
+            raise Exception(f"Malformed object {sha}: bad header")
+        fmt = bytes(mv[0:x])
+        # For big objects the payload isn't inflated yet, so the header is the only place its size comes from
+        # It must be plain ASCII digits, int() would also take signs, spaces and underscores
+        size_field = bytes(mv[x+1:y])
+        if not size_field.isdigit():
+            raise Exception(f"Malformed object {sha}: bad header")
+        size = int(size_field)
+
+        if header_only:
+            return fmt, size
 
         # Pick constructor
-        match fmt:
-            case b"commit" : c=GitCommit
-            case b"tree" : c=GitTree
-            case b"tag" : c=GitTag
-            case b"blob" : c=GitBlob
-            case _:
-                raise Exception(f"Unknow type {fmt.decode("ascii")} for object {sha}")
+        c = _FMT_TO_CLS.get(fmt)
+        if c is None:
+            raise Exception(f"Unknown type {fmt.decode('ascii')} for object {sha}")
+
+        # The whole object got inflated along with its header
+        if d.eof:
+            if size != len(header_buf)-y-1:
+                raise Exception(f"Malformed object {sha}: bad length")
+            return c(mv[y+1:])
+
+        # Inflate the rest into a buffer of the announced size
+        # The size isn't trusted for the allocation, past OBJECT_PREALLOC_MAX the buffer grows as data arrives
+        payload = bytearray(min(size, OBJECT_PREALLOC_MAX))
+        off = 0
+        chunk = mv[y+1:]
+        while True:
+            n = len(chunk)
+            if off + n > size:
+                raise Exception(f"Malformed object {sha}: bad length")
+            # Slice assignment past the end of a bytearray appends
+            payload[off:off+n] = chunk
+            off += n
+            if d.eof:
+                break
+            data_in = d.unconsumed_tail or f.read(OBJECT_CHUNK_SIZE)
+            if not data_in:
+                # Out of input, whatever zlib still holds is the last of it
+                chunk = d.flush()
+                if not chunk:
+                    break
+                continue
+            # A call may return nothing while the stream goes on (empty stored blocks, bits held back), only eof ends it
+            # Never more than a chunk at a time, one byte of slack lets us notice objects longer than announced
+            chunk = d.decompress(data_in, min(size - off + 1, OBJECT_CHUNK_SIZE))
+
+        if off != size:
+            raise Exception(f"Malformed object {sha}: bad length")
+        # Payload is all there, but the zlib stream must also end properly, checksum included
+        if not d.eof:
+            raise Exception(f"Malformed object {sha}: truncated data")
 
         # Send raw data to the class and return appropriate object
-        return c(raw[y+1:])
+        # Read-only, so the object can't modify the buffer behind its own back
+        return c(memoryview(payload).toreadonly())
+
+def _compress_to(f, header, data):
+    """Compress header + data chunk by chunk into the open binary file f"""
+    import zlib
+
+    co = zlib.compressobj(LOOSE_OBJECT_COMPRESSION_LEVEL)
+    f.write(co.compress(header))
+    view = memoryview(data)
+    for i in range(0, len(view), OBJECT_CHUNK_SIZE):
+        f.write(co.compress(view[i:i+OBJECT_CHUNK_SIZE]))
+    f.write(co.flush())
+
+def _write_loose_object_tmpfile(parent, path, header, data):
+    """Linux fast path of _write_loose_object, writes an anonymous O_TMPFILE and links it in once complete
+       Returns False when that isn't possible here, so the caller can take the portable path
+    """
+    # Linking the anonymous file in goes through /proc
+    if not hasattr(os, "O_TMPFILE") or not os.path.isdir("/proc/self/fd"):
+        return False
+    try:
+        fd = os.open(parent, os.O_TMPFILE | os.O_WRONLY, 0o444)
+    except OSError:
+        # Filesystem without O_TMPFILE support
+        return False
+
+    with os.fdopen(fd, "wb") as f:
+        _compress_to(f, header, data)
+        f.flush()
+
+        # Going through a dir fd makes link() follow the /proc symlink, a plain path won't
+        try:
+            proc = os.open("/proc/self/fd", os.O_RDONLY)
+            try:
+                os.link(str(f.fileno()), path, src_dir_fd=proc, follow_symlinks=True)
+            finally:
+                os.close(proc)
+        except FileExistsError:
+            # Someone else wrote the same object first, contents are identical
+            pass
+        except OSError:
+            # Linking through /proc can be refused, ex. in some sandboxes
+            return False
+
+    return True
+
+def _write_loose_object(path, header, data):
+    """Compress header + data into path without ever exposing a half written object
+       Writes to an anonymous O_TMPFILE and links it in on Linux, otherwise to a temp file that gets renamed
+    """
+    parent = os.path.dirname(path)
+
+    if _write_loose_object_tmpfile(parent, path, header, data):
+        return
+
+    import tempfile
+    fd, tmp = tempfile.mkstemp(dir=parent)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            _compress_to(f, header, data)
+        os.chmod(tmp, 0o444)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+@functools.lru_cache(maxsize=None)
+def _blake3():
+    """The optional blake3 module or None, imported on the first object write instead of at startup"""
+    try:
+        import blake3
+    except ModuleNotFoundError:
+        return None
+    return blake3
+
+# Least recently used cache of blake3 content digest -> SHA-1, only used when blake3 is installed
+OBJ_CACHE_SIZE = 1024
+_OBJ_CACHE = OrderedDict()
 
 def object_write(obj, repo=None):
     """Takes in an object, writes it in the proper directory based on its SHA"""
+    import hashlib
     # Serialize object data
     data = obj.serialize()
-    # Add header, make everything in byte format
-    result = obj.fmt + b" " + str(len(data)).encode() + b"\x00" + data
-    # Compute hash as hexadecimal string
-    sha = hashlib.sha1(result).hexdigest()
+    # Build the header on its own, so header + data never get copied into one big buffer
+    header = b"%s %d\x00" % (obj.fmt, len(data))
+
+    # If blake3 is available, a cheap digest of the content may already tell us the SHA
+    sha = None
+    key = None
+    blake3 = _blake3()
+    if blake3 is not None:
+        b = blake3.blake3(header)
+        b.update(data)
+        key = b.digest(length=16)
+        sha = _OBJ_CACHE.get(key)
+        if sha is not None:
+            try:
+                _OBJ_CACHE.move_to_end(key)
+            except KeyError:
+                # Evicted by another thread in the meantime, the sha is still valid
+                pass
+
+    if sha is None:
+        # Compute hash as hexadecimal string, feeding header then data
+        h = hashlib.sha1()
+        h.update(header)
+        h.update(data)
+        sha = h.hexdigest()
+
+        if key is not None:
+            _OBJ_CACHE[key] = sha
+            if len(_OBJ_CACHE) > OBJ_CACHE_SIZE:
+                _OBJ_CACHE.popitem(last=False)
 
     if repo:
         # Compute path
-        path=repo_file(repo, "objects", sha[0:2], sha[2:], mkdir=True)
+        path=_object_path(repo, sha)
 
+        # Same SHA means same content, so an existing object needs no compressing or writing
         if not os.path.exists(path):
-            with open(path, "wb") as f:
-                # Compress and write
-                f.write(zlib.compress(result))
+            # exist_ok since other hash_objects_bulk threads write into the same fan-out directories
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            _write_loose_object(path, header, data)
 
     return sha
 
@@ -242,14 +544,35 @@ def hash_object(fd, fmt, repo=None):
     data = fd.read()
 
     # Choose constructor according to fmt argument
-    match fmt:
-        case b"commit" : obj=GitCommit(data)
-        case b"tree" : obj=GitTree(data)
-        case b"tag" : obj=GitTag(data)
-        case b"blob" : obj=GitBlob(data)
+    c = _FMT_TO_CLS.get(fmt)
+    if c is None:
+        raise Exception(f"Unknown type {fmt.decode('ascii')}")
+    obj = c(data)
 
     return object_write(obj, repo)
 
+def hash_objects_bulk(paths, fmt, repo=None, workers=None):
+    """Hash every file in paths as fmt, writing them to .git/objects if repo is provided
+       SHA-1 and zlib release the GIL, so a thread pool hashes files in parallel
+       Returns the SHAs in the same order as paths
+    """
+
+    def _one(path):
+        with open(path, "rb") as fd:
+            return hash_object(fd, fmt, repo)
+
+    # Any iterable works, but we need its length
+    paths = list(paths)
+
+    # Not worth starting threads for a single file
+    if len(paths) < 2:
+        return [_one(path) for path in paths]
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        return list(pool.map(_one, paths))
+
 # -- commits
 def kvlm_parse(raw, start=0, dct=None):
     """
@@ -258,6 +581,10 @@ def kvlm_parse(raw, start=0, dct=None):
     Key-Value List with Message
     """
 
+    # object_read hands out memoryviews, which can't find(), parse a bytes copy instead
+    if not isinstance(raw, bytes):
+        raw = bytes(raw)
+
     if not dct:
         dct = dict()
 
@@ -329,11 +656,17 @@ def cmd_hash_object(args):
     else:
         repo = None
 
-    # open contents of file and hash object
-    with open(args.path, "rb") as fd:
-        sha = hash_object(fd, args.type.encode(), repo)
+    # open contents of every file and hash objects, in the order given
+    for sha in hash_objects_bulk(args.path, args.type.encode(), repo):
         print(sha)
 
+# Command name -> bridge function, other commands get added here as they are implemented
+_CMD_TO_FN = {
+    "cat-file"     : cmd_cat_file,
+    "hash-object"  : cmd_hash_object,
+    "init"         : cmd_init,
+}
+
 def main(argv=sys.argv[1:]):
     argparser = argparse.ArgumentParser(description="Program")
     # Initialize subparsers, which are the subcommands
@@ -354,24 +687,8 @@ def main(argv=sys.argv[1:]):
     argsp = argsubparsers.add_parser("hash-object", help="Compute object ID and optionally creates a blob from a file")
     argsp.add_argument("-t", metavar="type", dest="type", choices=["blob", "commit", "tag", "tree"], default="blob", help="Specify the type")
     argsp.add_argument("-w", dest="write", action="store_true", help="Actually write the object into the database")
-    argsp.add_argument("path", help="Read object from <file>")
+    argsp.add_argument("path", nargs="+", help="Read object from <file>")
 
     args = argparser.parse_args(argv)
 
-    match args.command:
-        case "add"          : cmd_add(args)
-        case "cat-file"     : cmd_cat_file(args)
-        case "check-ignore" : cmd_check_ignore(args)
-        case "checkout"     : cmd_checkout(args)
-        case "commit"       : cmd_commit(args)
-        case "hash-object"  : cmd_hash_object(args)
-        case "init"         : cmd_init(args)
-        case "log"          : cmd_log(args)
-        case "ls-files"     : cmd_ls_files(args)
-        case "ls-tree"      : cmd_ls_tree(args)
-        case "rev-parse"    : cmd_rev_parse(args)
-        case "rm"           : cmd_rm(args)
-        case "show-ref"     : cmd_show_ref(args)
-        case "status"       : cmd_status(args)
-        case "tag"          : cmd_tag(args)
-        case _              : print("Bad command.")
\ No newline at end of file
+    _CMD_TO_FN.get(args.command, lambda args: print("Bad command."))(args)
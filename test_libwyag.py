@@ -0,0 +1,125 @@
+import os
+import random
+import tempfile
+import unittest
+from unittest import mock
+import zlib
+
+import libwyag
+
+
+class ObjectReadTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.repo = libwyag.repo_create(self.tmp.name)
+        self.chunk_size = libwyag.OBJECT_CHUNK_SIZE
+
+    def tearDown(self):
+        libwyag.OBJECT_CHUNK_SIZE = self.chunk_size
+        self.tmp.cleanup()
+
+    def write_raw(self, raw, sha="ab" * 20):
+        """Store raw (already zlib compressed) bytes as the loose object sha"""
+        path = libwyag._object_path(self.repo, sha)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(raw)
+        return sha
+
+    def test_roundtrip_with_tiny_chunks(self):
+        rng = random.Random(0)
+        for chunk_size in (16, 37, 100):
+            libwyag.OBJECT_CHUNK_SIZE = chunk_size
+            for i in range(100):
+                data = bytes(rng.choice(b"abc\n") for _ in range(rng.randrange(2000)))
+                level = rng.choice((1, 6, 9))
+                sha = self.write_raw(zlib.compress(b"blob %d\x00" % len(data) + data, level), "%040x" % (chunk_size * 1000 + i))
+                obj = libwyag.object_read(self.repo, sha)
+                self.assertEqual(bytes(obj.serialize()), data, (chunk_size, i, level))
+
+    def test_empty_stored_blocks(self):
+        # Empty stored blocks inflate to nothing, but the stream goes on after them
+        data = os.urandom(1000) + b"x" * 400000
+        obj = b"blob %d\x00" % len(data) + data
+        co = zlib.compressobj(wbits=-15)
+        # A sync flush leaves the raw deflate stream byte aligned, so whole blocks can be spliced in
+        deflate = co.compress(obj[:2000]) + co.flush(zlib.Z_SYNC_FLUSH)
+        deflate += b"\x00\x00\x00\xff\xff" * 160000
+        deflate += co.compress(obj[2000:]) + co.flush()
+        raw = b"\x78\x9c" + deflate + zlib.adler32(obj).to_bytes(4, "big")
+        self.assertEqual(zlib.decompress(raw), obj)
+        sha = self.write_raw(raw)
+        self.assertEqual(bytes(libwyag.object_read(self.repo, sha).serialize()), data)
+
+    def test_written_objects_read_back(self):
+        for data in (b"", b"hello\n", os.urandom(1 << 20)):
+            sha = libwyag.object_write(libwyag.GitBlob(data), self.repo)
+            self.assertEqual(bytes(libwyag.object_read(self.repo, sha).serialize()), data)
+            self.assertEqual(libwyag.object_read(self.repo, sha, header_only=True), (b"blob", len(data)))
+
+    def test_tree_roundtrip(self):
+        raw = b"100644 a.txt\x00" + b"\x00" * 20 + b"40000 dir\x00" + b"\xff" * 20
+        sha = libwyag.object_write(libwyag.GitTree(raw), self.repo)
+        tree = libwyag.object_read(self.repo, sha)
+        self.assertEqual(tree.modes, [b"100644", b"40000"])
+        self.assertEqual(tree.names, [b"a.txt", b"dir"])
+        self.assertEqual(tree.shas, b"\x00" * 20 + b"\xff" * 20)
+        self.assertEqual(tree.serialize(), raw)
+        self.assertEqual(libwyag.object_write(libwyag.GitTree()), "4b825dc642cb6eb9a060e54bf8d69288fbee4904")
+
+    def test_write_falls_back_when_link_is_refused(self):
+        data = b"linked\n"
+        with mock.patch("os.link", side_effect=PermissionError):
+            sha = libwyag.object_write(libwyag.GitBlob(data), self.repo)
+        self.assertEqual(bytes(libwyag.object_read(self.repo, sha).serialize()), data)
+        self.assertEqual(os.listdir(os.path.dirname(libwyag._object_path(self.repo, sha))), [sha[2:]])
+
+    def test_malformed_objects(self):
+        cases = [
+            zlib.compress(b"blob -5\x00abc"),
+            zlib.compress(b"blob +3\x00abc"),
+            zlib.compress(b"blob \x00abc"),
+            zlib.compress(b"blob 999999999999999\x00" + b"a" * 400000),
+            zlib.compress(b"blob 5\x00abcdef"),
+            zlib.compress(b"blob 7\x00abcdef"),
+            zlib.compress(b"x" * 500),
+            # Checksum cut off
+            zlib.compress(b"blob 3\x00abc")[:-3],
+        ]
+        for i, raw in enumerate(cases):
+            sha = self.write_raw(raw, "%040x" % i)
+            with self.assertRaisesRegex(Exception, "Malformed object"):
+                libwyag.object_read(self.repo, sha)
+
+    def test_malformed_size_header_only(self):
+        sha = self.write_raw(zlib.compress(b"blob -5\x00abc"))
+        with self.assertRaisesRegex(Exception, "bad header"):
+            libwyag.object_read(self.repo, sha, header_only=True)
+
+
+
+class RepoTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_create_on_a_file(self):
+        path = os.path.join(self.tmp.name, "afile")
+        open(path, "w").close()
+        with self.assertRaisesRegex(Exception, "is not a directory!"):
+            libwyag.repo_create(path)
+
+    def test_find_from_subdirectory(self):
+        libwyag.repo_create(self.tmp.name)
+        sub = os.path.join(self.tmp.name, "a", "b")
+        os.makedirs(sub)
+        repo = libwyag.repo_find(sub)
+        self.assertEqual(repo.worktree, os.path.realpath(self.tmp.name))
+
+
+if __name__ == "__main__":
+    unittest.main()